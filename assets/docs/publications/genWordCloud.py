@@ -1,53 +1,60 @@
 # Simple WordCloud
+import argparse
+from functools import lru_cache
 from os import path
 from PIL import Image
 import numpy as np
 from wordcloud import WordCloud, STOPWORDS
-import matplotlib.pyplot as plt
 import nltk
+import re
 import time
 import sys
 
-def doTask(mask):
+# words of letters only (unicode included), dropping punctuation and numbers
+WORD_RE = re.compile(r'[^\W\d_]+')
+
+# words that are common in our abstracts but say nothing about the work
+EXTRA_STOPWORDS = frozenset({
+	"abstract",
+	"describe",
+	"provide",
+	"better",
+	"straightforward",
+	"information",
+	"using",
+	"picture",
+	"pictures",
+	"however",
+	"use",
+	"used",
+	"result",
+	"also",
+	"take",
+	"taken",
+	"source",
+	"providing",
+	"help",
+})
+
+@lru_cache(maxsize=None)
+def getStopwords(language):
+	# nltk's list, wordcloud's defaults and our extras in one set, loaded
+	# from the corpus once so each word is a single hashed lookup
+	return frozenset(nltk.corpus.stopwords.words(language)) | STOPWORDS | EXTRA_STOPWORDS
+
+def doTask(mask, show=False):
 	d = path.dirname(__file__)
 
 	# Read the whole file_data.
-	file_data = open(path.join(d, 'word-cloud.txt')).read()
-
-	#removed all the punctuation
-	tokens = nltk.wordpunct_tokenize(file_data)
-	file_data = nltk.Text(tokens)
-	word_list = [w.lower() for w in file_data if w.isalpha()]
-
-	# use nltk to remove english stopwords
-	filtered_words = [word for word in word_list if word not in nltk.corpus.stopwords.words('english')]
-
-	text_to_process = ' '.join(filtered_words)
-
-	stopwords = set(STOPWORDS)
-	stopwords.add("Abstract")
-	stopwords.add("describe")
-	stopwords.add("provide")
-	stopwords.add("better")
-	stopwords.add("straightforward")
-	stopwords.add("information")
-	stopwords.add("using")
-	stopwords.add("picture")
-	stopwords.add("pictures")
-	stopwords.add("however")
-	stopwords.add("use")
-	stopwords.add("used")
-	stopwords.add("result")
-	stopwords.add("also")
-	stopwords.add("take")
-	stopwords.add("taken")
-	stopwords.add("source")
-	stopwords.add("providing")
-	stopwords.add("help")
+	with open(path.join(d, 'word-cloud.txt'), encoding='utf-8') as f:
+		file_data = f.read()
 
+	stopwords = getStopwords('english')
+
+	mask_array = None
 	if mask == "None":
 		# lower max_font_size
-		wordcloud = WordCloud(background_color="white", max_font_size=50, stopwords=stopwords)
+		wordcloud = WordCloud(background_color="white", max_font_size=50, stopwords=stopwords, regexp=WORD_RE, min_word_length=2)
 	else:
 		# mask_name="vader"
 		mask_image_filename=mask+".png"
@@ -55,38 +62,45 @@ def doTask(mask):
 		# read the mask image
 		# taken from
 		# http://www.stencilry.org/stencils/movies/alice%20in%20wonderland/255fk.jpg
-		mask = np.array(Image.open(path.join(d, mask_image_filename)))
+		# asarray wraps the decoded pixels instead of copying them again
+		with Image.open(path.join(d, mask_image_filename)) as mask_image:
+			mask_array = np.asarray(mask_image)
 
 		# lower max_font_size
-		wordcloud = WordCloud(background_color="white", mask=mask, stopwords=stopwords)
+		wordcloud = WordCloud(background_color="white", mask=mask_array, stopwords=stopwords, regexp=WORD_RE, min_word_length=2)
 		# max_font_size=60
 
-	# generate word cloud
-	wordcloud.generate(text_to_process)
+	# generate word cloud; wordcloud splits the text with WORD_RE in a single
+	# pass, drops stopwords, folds plurals and keeps frequent bigrams
+	wordcloud.generate(file_data.lower())
 
 	# store to file
 	wordcloud.to_file(path.join(d, "wordcloud.png"))
 
-	# # show
-	# plt.imshow(wordcloud, interpolation='bilinear')
-	# plt.axis("off")
-	# plt.figure()
-	# plt.imshow(mask, cmap=plt.cm.gray, interpolation='bilinear')
-	# plt.axis("off")
-	# plt.show()
+	if show:
+		# pyplot is only needed to display the cloud
+		import matplotlib.pyplot as plt
+		plt.imshow(wordcloud, interpolation='bilinear')
+		plt.axis("off")
+		if mask_array is not None:
+			plt.figure()
+			plt.imshow(mask_array, cmap=plt.cm.gray, interpolation='bilinear')
+			plt.axis("off")
+		plt.show()
 
 	# The pil way (if you don't have matplotlib)
 	# image = wordcloud.to_image()
 	# image.show()
 
 def main(argv):
-	if len(sys.argv) != 2:
-		sys.stderr.write('Usage: python getWordCloud.py mask\n')
-		sys.exit(1)
+	parser = argparse.ArgumentParser(prog='genWordCloud.py')
+	parser.add_argument('mask', help='mask image name without .png, or None for no mask')
+	parser.add_argument('--show', action='store_true', help='display the word cloud with matplotlib')
+	args = parser.parse_args(argv[1:])
 
 	startTime = time.time()
 
-	doTask(sys.argv[1])
+	doTask(args.mask, args.show)
 	
 	executionTime = str((time.time()-startTime)*1000)
 	print('Execution time was: '+executionTime+' ms')